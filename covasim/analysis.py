@@ -450,6 +450,7 @@ class Fit(sc.prettyobj):
             errormsg = f'The following requested key(s) were not found in the data: {mismatchstr}'
             raise sc.KeyNotFoundError(errormsg)
 
+        sim_date_inds = {d:i for i,d in enumerate(self.sim_dates)} # Map each date to its sim index, rather than searching the list of dates for every data point
         for key in self.keys: # For keys present in both the results and in the data
             self.inds.sim[key]  = []
             self.inds.data[key] = []
@@ -458,24 +459,18 @@ class Fit(sc.prettyobj):
             for d, datum in self.data[key].iteritems():
                 count += 1
                 if np.isfinite(datum):
-                    if d in self.sim_dates:
+                    if d in sim_date_inds:
                         self.date_matches[key].append(d)
-                        self.inds.sim[key].append(self.sim_dates.index(d))
+                        self.inds.sim[key].append(sim_date_inds[d])
                         self.inds.data[key].append(count)
-            self.inds.sim[key]  = np.array(self.inds.sim[key])
-            self.inds.data[key] = np.array(self.inds.data[key])
+            self.inds.sim[key]  = np.array(self.inds.sim[key], dtype=int)
+            self.inds.data[key] = np.array(self.inds.data[key], dtype=int)
 
         # Convert into paired points
         for key in self.keys:
             self.pair[key] = sc.objdict()
-            sim_inds = self.inds.sim[key]
-            data_inds = self.inds.data[key]
-            n_inds = len(sim_inds)
-            self.pair[key].sim  = np.zeros(n_inds)
-            self.pair[key].data = np.zeros(n_inds)
-            for i in range(n_inds):
-                self.pair[key].sim[i]  = self.sim_results[key].values[sim_inds[i]]
-                self.pair[key].data[i] = self.data[key].values[data_inds[i]]
+            self.pair[key].sim  = np.array(self.sim_results[key].values[self.inds.sim[key]], dtype=float)
+            self.pair[key].data = np.array(self.data[key].values[self.inds.data[key]], dtype=float)
 
         # Process custom inputs
         self.custom_keys = list(self.custom.keys())
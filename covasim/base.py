@@ -13,7 +13,7 @@ from . import misc as cvm
 from . import defaults as cvd
 
 # Specify all externally visible classes this file defines
-__all__ = ['ParsObj', 'Result', 'BaseSim', 'BasePeople', 'Person', 'FlexDict', 'Contacts', 'Layer']
+__all__ = ['ParsObj', 'Result', 'BaseSim', 'BasePeople', 'Person', 'FlexDict', 'Contacts', 'Layer', 'InfectionLog']
 
 
 #%% Define simulation classes
@@ -196,7 +196,7 @@ class BaseSim(ParsObj):
 
         '''
         try:
-            return self['start_day'] + self.tvec * dt.timedelta(days=1)
+            return (np.datetime64(self['start_day'], 'D') + self.tvec).astype(object) # Compute in NumPy, then convert to dates
         except:
             return np.array([])
 
@@ -555,7 +555,7 @@ class BasePeople(sc.prettyobj):
         self.meta = cvd.PeopleMeta() # Store list of keys and dtypes
         self.contacts = None
         self.init_contacts() # Initialize the contacts
-        self.infection_log = [] # Record of infections - keys for ['source','target','date','layer']
+        self.infection_log = InfectionLog() # Record of infections - keys for ['source','target','date','layer']
 
         # Set person properties -- all floats except for UID
         for key in self.meta.person:
@@ -1142,3 +1142,135 @@ class Layer(FlexDict):
             contact_inds = np.fromiter(contact_inds, dtype=cvd.default_int)
             contact_inds.sort()  # Sorting ensures that the results are reproducible for a given seed as well as being identical to previous versions of Covasim
         return contact_inds
+
+
+class InfectionLog(sc.prettyobj):
+    '''
+    A record of all infections, stored as arrays (one entry per infection) of the
+    source, target, date, and layer of each transmission. Iterating over or indexing
+    the log gives each entry as a dict with keys ['source','target','date','layer'],
+    and slicing it gives a list of these. Seed infections and importations have no
+    source (None, or -1 in the source array), and are recorded with the layer
+    'seed_infection' or 'importation' respectively.
+
+    **Example**::
+
+        log = sim.people.infection_log
+        seeds = log.target[log.source == -1] # Arrays are available directly
+        first = log[0] # Entries can be retrieved as dicts
+        latest = log[-10:] # Or as a list of dicts
+    '''
+
+    def __init__(self):
+        self.n = 0 # Number of infections recorded
+        self.layer_keys = [] # Layer keys, referred to by position in the layer array
+        self._data = {
+            'source': np.empty(0, dtype=np.int64), # Person who transmitted the infection, or -1 if none
+            'target': np.empty(0, dtype=np.int64), # Person who was infected
+            'date':   np.empty(0, dtype=np.int64), # Timestep the infection took place
+            'layer':  np.empty(0, dtype=np.int16), # Position of the layer key in layer_keys, or -1 if none
+        }
+        return
+
+
+    def __len__(self):
+        return self.n
+
+
+    def __getitem__(self, ind):
+        ''' Return a single entry as a dict, or a slice of entries as a list of dicts '''
+        if isinstance(ind, slice):
+            return list(self._entries(ind))
+        ind = range(self.n)[ind] # Handle negative indices and raise an IndexError if out of bounds
+        return self._entry(*[int(self._data[key][ind]) for key in ['source', 'target', 'date', 'layer']])
+
+
+    def __iter__(self):
+        ''' Iterate over entries as dicts '''
+        return self._entries()
+
+
+    def __eq__(self, other):
+        ''' Logs are equal if they record the same infections; a log also equals the list of its entries '''
+        if isinstance(other, InfectionLog):
+            return self.n == other.n and self.layer_keys == other.layer_keys and all(np.array_equal(self._data[key][:self.n], other._data[key][:other.n]) for key in self._data)
+        elif isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+
+    def _entries(self, ind=slice(None)):
+        ''' Yield the entries in a slice of the log as dicts '''
+        for source, target, date, lind in zip(self.source[ind].tolist(), self.target[ind].tolist(), self.date[ind].tolist(), self.layer[ind].tolist()):
+            yield self._entry(source, target, date, lind)
+
+
+    def _entry(self, source, target, date, lind):
+        ''' Convert a row of the arrays to a dict, with -1 mapped back to None '''
+        return dict(source=None if source < 0 else source, target=target, date=date, layer=None if lind < 0 else self.layer_keys[lind])
+
+
+    @property
+    def source(self):
+        return self._data['source'][:self.n]
+
+    @property
+    def target(self):
+        return self._data['target'][:self.n]
+
+    @property
+    def date(self):
+        return self._data['date'][:self.n]
+
+    @property
+    def layer(self):
+        return self._data['layer'][:self.n]
+
+
+    def add(self, date, target, source=None, layer=None):
+        '''
+        Record a set of infections that took place on the same date and layer.
+
+        Args:
+            date (int): the timestep of the infections
+            target (array): indices of the people infected
+            source (array): indices of the people who infected them (None if e.g. seed infections)
+            layer (str): contact layer the infections were transmitted on (None if e.g. seed infections)
+        '''
+        n_new = len(target)
+        n_total = self.n + n_new
+        if n_total > len(self._data['target']): # Grow the arrays by doubling, so resizing doesn't happen on every call
+            capacity = max(2*len(self._data['target']), n_total)
+            for key,arr in self._data.items():
+                self._data[key] = np.resize(arr, capacity)
+
+        if layer is None:
+            lind = -1
+        else:
+            if layer not in self.layer_keys:
+                self.layer_keys.append(layer)
+            lind = self.layer_keys.index(layer)
+
+        self._data['source'][self.n:n_total] = -1 if source is None else source
+        self._data['target'][self.n:n_total] = target
+        self._data['date'][self.n:n_total]   = date
+        self._data['layer'][self.n:n_total]  = lind
+        self.n = n_total
+        return
+
+
+    def append(self, entry):
+        ''' Record a single infection, given as a dict with keys ['source','target','date','layer'] '''
+        source = None if entry['source'] is None else [entry['source']]
+        self.add(date=entry['date'], target=[entry['target']], source=source, layer=entry['layer'])
+        return
+
+
+    def to_df(self):
+        ''' Convert to a dataframe, with missing sources as NaN and missing layers as None '''
+        source = self.source
+        if (source < 0).any(): # Match the float source column that pandas creates from a list of entries containing None
+            source = np.where(source < 0, np.nan, source)
+        layer_keys = np.array(self.layer_keys + [None], dtype=object) # Index -1 maps to None
+        df = pd.DataFrame(dict(source=source, target=self.target, date=self.date, layer=layer_keys[self.layer]))
+        return df
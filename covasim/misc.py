@@ -2,6 +2,7 @@
 Miscellaneous functions that do not belong anywhere else
 '''
 
+import os
 import numpy as np
 import pandas as pd
 import pylab as pl
@@ -9,36 +10,95 @@ import sciris as sc
 import datetime as dt
 import scipy.stats as sps
 from . import version as cvver
+from . import requirements as cvreq
 
-__all__ = ['load_data', 'date', 'day', 'daydiff', 'date_range', 'load', 'save', 'savefig', 'get_png_metadata', 'git_info', 'check_version', 'check_save_version', 'get_doubling_time', 'poisson_test', 'compute_gof']
+__all__ = ['load_data', 'clear_data_cache', 'date', 'day', 'daydiff', 'date_range', 'load', 'save', 'savefig', 'get_png_metadata', 'git_info', 'check_version', 'check_save_version', 'get_doubling_time', 'poisson_test', 'compute_gof']
 
 
-def load_data(datafile, columns=None, calculate=True, check_date=True, verbose=True, **kwargs):
+_data_cache = {} # The most recently loaded version of each data file, keyed by absolute path -- used by load_data()
+
+
+def load_data(datafile, columns=None, calculate=True, check_date=True, verbose=True, cache=True, **kwargs):
     '''
     Load data for comparing to the model output, either from file or from a dataframe.
 
     Args:
-        datafile (str or df): if a string, the name of the file to load (either Excel or CSV); if a dataframe, use directly
+        datafile (str or df): if a string, the name of the file to load (Excel, CSV, JSON, Parquet, or Feather); if a dataframe, use directly
         columns (list): list of column names (otherwise, load all)
         calculate (bool): whether to calculate cumulative values from daily counts
         check_date (bool): whether to check that a 'date' column is present
-        kwargs (dict): passed to pd.read_excel()
+        cache (bool): whether to reuse the data if this file (unmodified) was last loaded with the same options; only the latest load of each file is kept (see cv.clear_data_cache())
+        kwargs (dict): passed to pd.read_excel() (or pd.read_csv() etc.), e.g. nrows or skiprows to load only part of a large file; for Excel files, the faster calamine engine is used by default if available
 
     Returns:
         data (dataframe): pandas dataframe of the loaded data
+
+    **Example**::
+
+        data = cv.load_data('my_data.xlsx')
+        data = cv.load_data('my_data.csv', columns=['date', 'new_diagnoses'], nrows=30) # Only load the first 30 days of diagnoses
+        pd.read_excel('my_data.xlsx').to_parquet('my_data.parquet') # Convert once for much faster loading in future
+        data = cv.load_data('my_data.parquet')
     '''
 
+    # Return a copy of previously loaded data if the file has not changed since
+    cache_path = None
+    if cache and isinstance(datafile, str) and os.path.isfile(datafile):
+        stat = os.stat(datafile)
+        cache_path = os.path.abspath(datafile)
+        cache_sig = (stat.st_mtime_ns, stat.st_size, repr(columns), calculate, check_date, repr(sorted(kwargs.items())))
+        cached = _data_cache.get(cache_path)
+        if cached is not None and cached[0] == cache_sig:
+            _, data, messages = cached
+            if verbose:
+                for message in messages: # Repeat the messages from the original load
+                    print(message)
+            return data.copy()
+
+    # Only parse the requested columns -- use a callable so missing columns are reported below rather than by pandas
+    usecols = kwargs.pop('usecols', None)
+    if usecols is None and columns is not None:
+        colset = set(columns)
+        usecols = lambda col: col in colset
+
+    # Parse dates while reading rather than inferring them afterwards
+    default_dates = False # Whether parse_dates was added here, rather than by the user
+    if check_date and (columns is None or 'date' in columns) and 'parse_dates' not in kwargs:
+        kwargs['parse_dates'] = ['date']
+        default_dates = True
+
     # Load data
     if isinstance(datafile, str):
         df_lower = datafile.lower()
         if df_lower.endswith('csv'):
-            raw_data = pd.read_csv(datafile, **kwargs)
+            raw_data = _read_data(pd.read_csv, datafile, default_dates, usecols=usecols, **kwargs)
         elif df_lower.endswith('xlsx') or df_lower.endswith('xls'):
-            raw_data = pd.read_excel(datafile, **kwargs)
+            if kwargs.get('engine') is None and cvreq.check_calamine():
+                kwargs['engine'] = 'calamine' # Much faster than the default openpyxl/xlrd engines
+            raw_data = _read_data(pd.read_excel, datafile, default_dates, usecols=usecols, **kwargs)
         elif df_lower.endswith('json'):
+            kwargs.pop('parse_dates', None) # Not supported by pd.read_json(); dates are converted below
             raw_data = pd.read_json(datafile, **kwargs)
+        elif df_lower.endswith('parquet') or df_lower.endswith('feather'): # Binary columnar formats: much faster to load than CSV or Excel
+            kwargs.pop('parse_dates', None) # Not needed, since types are stored in the file
+            is_parquet = df_lower.endswith('parquet')
+            read_cols = columns
+            if columns is not None: # Only request the columns that are in the file, so missing ones are reported below
+                if cvreq.check_pyarrow():
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+                    if is_parquet:
+                        schema = pq.read_schema(datafile)
+                    else:
+                        with pa.OSFile(datafile, 'rb') as f:
+                            schema = pa.ipc.open_file(f).schema
+                    read_cols = [col for col in columns if col in schema.names]
+                else:
+                    read_cols = None # The schema can't be read on its own, so load all columns
+            reader = pd.read_parquet if is_parquet else pd.read_feather
+            raw_data = reader(datafile, columns=read_cols, **kwargs)
         else:
-            errormsg = f'Currently loading is only supported from .csv, .xls/.xlsx, and .json files, not "{datafile}"'
+            errormsg = f'Currently loading is only supported from .csv, .xls/.xlsx, .json, .parquet, and .feather files, not "{datafile}"'
             raise NotImplementedError(errormsg)
     elif isinstance(datafile, pd.DataFrame):
         raw_data = datafile
@@ -48,15 +108,17 @@ def load_data(datafile, columns=None, calculate=True, check_date=True, verbose=T
 
     # Confirm data integrity and simplify
     if columns is not None:
-        for col in columns:
-            if col not in raw_data.columns:
-                errormsg = f'Column "{col}" is missing from the loaded data'
-                raise ValueError(errormsg)
-        data = raw_data[columns]
+        loaded_cols = set(raw_data.columns)
+        missing = [col for col in columns if col not in loaded_cols]
+        if missing:
+            errormsg = f'Column(s) {missing} missing from the loaded data'
+            raise ValueError(errormsg)
+        data = raw_data[columns] # Only reorders the columns if they were already selected on load
     else:
         data = raw_data
 
     # Calculate any cumulative columns that are missing
+    messages = [] # Stored with the cached data
     if calculate:
         columns = data.columns
         for col in columns:
@@ -64,8 +126,9 @@ def load_data(datafile, columns=None, calculate=True, check_date=True, verbose=T
                 cum_col = col.replace('new_', 'cum_')
                 if cum_col not in columns:
                     data[cum_col] = np.cumsum(data[col])
+                    messages.append(f'  Automatically adding cumulative column {cum_col} from {col}')
                     if verbose:
-                        print(f'  Automatically adding cumulative column {cum_col} from {col}')
+                        print(messages[-1])
 
     # Ensure required columns are present and reset the index
     if check_date:
@@ -76,9 +139,41 @@ def load_data(datafile, columns=None, calculate=True, check_date=True, verbose=T
             data['date'] = pd.to_datetime(data['date']).dt.date
         data.set_index('date', inplace=True, drop=False) # Don't drop so sim.data['date'] can still be accessed
 
+    if cache_path is not None:
+        _data_cache[cache_path] = (cache_sig, data.copy(), messages) # Store a copy so changes to the returned data don't affect later loads; replaces any older version of this file
+
     return data
 
 
+def clear_data_cache():
+    '''
+    Clear the data files kept by cv.load_data(), e.g. to free memory after loading
+    large files.
+
+    **Example**::
+
+        data = cv.load_data('my_data.csv')
+        cv.clear_data_cache() # The next load will read the file again
+    '''
+    _data_cache.clear()
+    return
+
+
+def _read_data(reader, datafile, default_dates, **kwargs):
+    '''
+    Read a data file with the given pandas reader. If the default parse_dates
+    added by load_data() fails because the file has no date column, read it
+    again without, so that load_data() can report the missing column itself.
+    '''
+    try:
+        return reader(datafile, **kwargs)
+    except ValueError as E:
+        if default_dates and 'parse_dates' in str(E):
+            kwargs.pop('parse_dates')
+            return reader(datafile, **kwargs)
+        raise
+
+
 def date(obj, *args, start_date=None, dateformat=None, as_date=True):
     '''
     Convert a string or a datetime object to a date object. To convert to an integer
@@ -301,9 +396,11 @@ def get_caller(frame=2, tostring=True):
         '''
         try:
             import inspect
-            result = inspect.getouterframes(inspect.currentframe(), 2)
-            fname = str(result[frame][1])
-            lineno = str(result[frame][2])
+            caller = inspect.currentframe()
+            for f in range(frame): # Walk back through the frames directly, since inspect.getouterframes() reads the source of every frame in the stack
+                caller = caller.f_back
+            fname = str(caller.f_code.co_filename)
+            lineno = str(caller.f_lineno)
             if tostring:
                 output = f'{fname}, line {lineno}'
             else:
@@ -4,6 +4,7 @@ Set the parameters for Covasim.
 
 import numpy as np
 import sciris as sc
+from types import MappingProxyType
 
 __all__ = ['make_pars', 'reset_layer_pars', 'get_prognoses']
 
@@ -105,6 +106,24 @@ def make_pars(set_prognoses=False, prog_by_age=True, **kwargs):
 # Define which parametrs need to be specified as a dictionary by layer -- define here so it's available at the module level for sim.py
 layer_pars = ['beta_layer', 'contacts', 'dynam_layer', 'iso_factor', 'quar_factor']
 
+# Specify defaults for random -- layer 'a' for 'all'; defined once at the module level since used by every call to make_pars(), and read-only so they cannot be modified accidentally
+layer_defaults_r = MappingProxyType(dict(
+    beta_layer  = MappingProxyType(dict(a=1.0)), # Default beta
+    contacts    = MappingProxyType(dict(a=20)),  # Default number of contacts
+    dynam_layer = MappingProxyType(dict(a=0)),   # Do not use dynamic layers by default
+    iso_factor  = MappingProxyType(dict(a=0.2)), # Assumed isolation factor
+    quar_factor = MappingProxyType(dict(a=0.3)), # Assumed quarantine factor
+))
+
+# Specify defaults for hybrid (and SynthPops) -- household, school, work, and community layers (h, s, w, c)
+layer_defaults_h = MappingProxyType(dict(
+    beta_layer  = MappingProxyType(dict(h=3.0, s=0.6, w=0.6, c=0.3)), # Per-population beta weights; relative
+    contacts    = MappingProxyType(dict(h=2.0, s=20,  w=16,  c=20)),   # Number of contacts per person per day, estimated
+    dynam_layer = MappingProxyType(dict(h=0,   s=0,   w=0,   c=0)),    # Which layers are dynamic -- none by default
+    iso_factor  = MappingProxyType(dict(h=0.3, s=0.1, w=0.1, c=0.1)),  # Multiply beta by this factor for people in isolation
+    quar_factor = MappingProxyType(dict(h=0.6, s=0.2, w=0.2, c=0.2)),  # Multiply beta by this factor for people in quarantine
+))
+
 
 def reset_layer_pars(pars, layer_keys=None, force=False):
     '''
@@ -117,48 +136,30 @@ def reset_layer_pars(pars, layer_keys=None, force=False):
         force (bool): reset the pars even if they already exist
     '''
 
-    # Specify defaults for random -- layer 'a' for 'all'
-    defaults_r = dict(
-        beta_layer  = dict(a=1.0), # Default beta
-        contacts    = dict(a=20),  # Default number of contacts
-        dynam_layer = dict(a=0),   # Do not use dynamic layers by default
-        iso_factor  = dict(a=0.2), # Assumed isolation factor
-        quar_factor = dict(a=0.3), # Assumed quarantine factor
-    )
-
-    # Specify defaults for hybrid (and SynthPops) -- household, school, work, and community layers (h, s, w, c)
-    defaults_h = dict(
-        beta_layer  = dict(h=3.0, s=0.6, w=0.6, c=0.3), # Per-population beta weights; relative
-        contacts    = dict(h=2.0, s=20,  w=16,  c=20),   # Number of contacts per person per day, estimated
-        dynam_layer = dict(h=0,   s=0,   w=0,   c=0),    # Which layers are dynamic -- none by default
-        iso_factor  = dict(h=0.3, s=0.1, w=0.1, c=0.1),  # Multiply beta by this factor for people in isolation
-        quar_factor = dict(h=0.6, s=0.2, w=0.2, c=0.2),  # Multiply beta by this factor for people in quarantine
-    )
-
     # Choose the parameter defaults based on the population type, and get the layer keys
     if pars['pop_type'] == 'random':
-        defaults = defaults_r
+        defaults = layer_defaults_r
         default_layer_keys = ['a'] # Although this could be retrieved from the dictionary, make it explicit
     else:
-        defaults = defaults_h
-        default_layer_keys = ['h', 's', 'w', 'c'] # NB, these must match defaults_h above
+        defaults = layer_defaults_h
+        default_layer_keys = ['h', 's', 'w', 'c'] # NB, these must match layer_defaults_h above
 
     # Actually set the parameters
     for pkey in layer_pars:
         par = {} # Initialize this parameter
-        default_val = defaults_r[pkey]['a'] # Get the default value for this parameter
+        default_val = layer_defaults_r[pkey]['a'] # Get the default value for this parameter
 
         # If forcing, we overwrite any existing parameter values
         if force:
             par_dict = defaults[pkey] # Just use defaults
         else:
-            par_dict = sc.mergedicts(defaults[pkey], pars.get(pkey, None)) # Use user-supplied parameters if available, else default
+            par_dict = sc.mergedicts(dict(defaults[pkey]), pars.get(pkey, None)) # Use user-supplied parameters if available, else default; convert since sc.mergedicts() skips non-dicts
 
         # Figure out what the layer keys for this parameter are (may be different between parameters)
         if layer_keys:
             par_layer_keys = layer_keys # Use supplied layer keys
         else:
-            par_layer_keys = list(sc.odict.fromkeys(default_layer_keys + list(par_dict.keys())))  # If not supplied, use the defaults, plus any extra from the par_dict; adapted from https://www.askpython.com/python/remove-duplicate-elements-from-list-python
+            par_layer_keys = list(dict.fromkeys(default_layer_keys + list(par_dict.keys())))  # If not supplied, use the defaults, plus any extra from the par_dict; dicts preserve insertion order, so this removes duplicates without reordering
 
         # Construct this parameter, layer by layer
         for lkey in par_layer_keys: # Loop over layers
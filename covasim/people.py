@@ -49,7 +49,8 @@ class People(cvb.BasePeople):
             else:
                 self[key] = value
 
-        self._pending_quarantine = defaultdict(list)  # Internal cache to record people that need to be quarantined on each timestep {t:(person, quarantine_end_day)}
+        self._pending_quarantine_inds = defaultdict(list) # Internal cache to record people that need to be quarantined on each timestep {t:[array of people]}
+        self._pending_quarantine_ends = defaultdict(list) # The corresponding quarantine end days {t:[array of quarantine_end_days]}
         return
 
 
@@ -72,19 +73,14 @@ class People(cvb.BasePeople):
             errormsg = 'This people object does not have the required parameters ("prognoses"). Create a sim (or parameters), then do e.g. people.set_pars(sim.pars).'
             raise sc.KeyNotFoundError(errormsg)
 
-        def find_cutoff(age_cutoffs, age):
-            '''
-            Find which age bin each person belongs to -- e.g. with standard
-            age bins 0, 10, 20, etc., ages [5, 12, 4, 58] would be mapped to
-            indices [0, 1, 0, 5]. Age bins are not guaranteed to be uniform
-            width, which is why this can't be done as an array operation.
-            '''
-            return np.nonzero(age_cutoffs <= age)[0][-1]  # Index of the age bin to use
-
         cvu.set_seed(pars['rand_seed'])
 
+        # Find which age bin each person belongs to -- e.g. with standard age bins 0, 10, 20, etc., ages [5, 12, 4, 58]
+        # would be mapped to indices [0, 1, 0, 5]. Age bins are not guaranteed to be uniform width, hence the binary search.
         progs = pars['prognoses'] # Shorten the name
-        inds = np.fromiter((find_cutoff(progs['age_cutoffs'], this_age) for this_age in self.age), dtype=cvd.default_int, count=len(self)) # Convert ages to indices
+        cutoffs = np.asarray(progs['age_cutoffs'])
+        inds = np.searchsorted(cutoffs, self.age, side='right') - 1 # Index of the age bin to use
+        inds = np.clip(inds, 0, len(cutoffs)-1).astype(cvd.default_int) # Convert ages to indices
         self.symp_prob[:]   = progs['symp_probs'][inds] # Probability of developing symptoms
         self.severe_prob[:] = progs['severe_probs'][inds]*progs['comorbidities'][inds] # Severe disease probability is modified by comorbidities
         self.crit_prob[:]   = progs['crit_probs'][inds] # Probability of developing critical disease
@@ -104,12 +100,9 @@ class People(cvb.BasePeople):
 
         # Perform updates
         self.flows  = {key:0 for key in cvd.new_result_flows}
-        self.flows['new_infectious']  += self.check_infectious() # For people who are exposed and not infectious, check if they begin being infectious
-        self.flows['new_symptomatic'] += self.check_symptomatic()
-        self.flows['new_severe']      += self.check_severe()
-        self.flows['new_critical']    += self.check_critical()
-        self.flows['new_deaths']      += self.check_death()
-        self.flows['new_recoveries']  += self.check_recovery()
+        counts = self.check_progression() # For people who are exposed, check if they become infectious, symptomatic, severe, or critical, or die or recover
+        for key,count in zip(['new_infectious', 'new_symptomatic', 'new_severe', 'new_critical', 'new_deaths', 'new_recoveries'], counts):
+            self.flows[key] += count
 
         return
 
@@ -129,24 +122,24 @@ class People(cvb.BasePeople):
         dynam_keys = [lkey for lkey,is_dynam in self.pars['dynam_layer'].items() if is_dynam]
 
         # Loop over dynamic keys
+        pop_size = len(self)
         for lkey in dynam_keys:
             # Remove existing contacts
             self.contacts.pop(lkey)
 
             # Choose how many contacts to make
-            pop_size   = len(self)
             n_contacts = self.pars['contacts'][lkey]
             n_new = int(n_contacts*pop_size/2) # Since these get looped over in both directions later
 
-            # Create the contacts
-            new_contacts = {} # Initialize
-            new_contacts['p1']   = np.array(cvu.choose_r(max_n=pop_size, n=n_new), dtype=cvd.default_int) # Choose with replacement
-            new_contacts['p2']   = np.array(cvu.choose_r(max_n=pop_size, n=n_new), dtype=cvd.default_int)
-            new_contacts['beta'] = np.ones(n_new, dtype=cvd.default_float)
+            # Create the contacts -- directly as a layer, rather than via add_contacts(), since they're already in the right format
+            new_layer = cvb.Layer()
+            new_layer['p1']   = cvu.choose_r(max_n=pop_size, n=n_new).astype(cvd.default_int) # Choose with replacement
+            new_layer['p2']   = cvu.choose_r(max_n=pop_size, n=n_new).astype(cvd.default_int)
+            new_layer['beta'] = np.ones(n_new, dtype=cvd.default_float)
 
             # Add to contacts
-            self.add_contacts(new_contacts, lkey=lkey)
-            self.contacts[lkey].validate()
+            new_layer.validate()
+            self.contacts[lkey] = new_layer
 
         return self.contacts
 
@@ -156,14 +149,23 @@ class People(cvb.BasePeople):
     def check_inds(self, current, date, filter_inds=None):
         ''' Return indices for which the current state is false and which meet the date criterion '''
         if filter_inds is None:
-            not_current = cvu.false(current)
+            inds = cvu.true(~current & (date <= self.t)) # NaN dates compare as False, so undefined dates are excluded
         else:
-            not_current = cvu.ifalsei(current, filter_inds)
-        has_date = cvu.idefinedi(date, not_current)
-        inds     = cvu.itrue(self.t >= date[has_date], has_date)
+            inds = cvu.itrue(~current[filter_inds] & (date[filter_inds] <= self.t), filter_inds)
         return inds
 
 
+    def check_progression(self):
+        '''
+        Check for new progressions to infectious, symptomatic, severe, and critical,
+        and for deaths and recoveries, among the people who are currently exposed
+        '''
+        counts = cvu.update_states(self.t, self.is_exp, self.exposed, self.infectious, self.symptomatic, self.severe, self.critical, self.recovered, self.dead,
+                                   self.date_infectious, self.date_symptomatic, self.date_severe, self.date_critical, self.date_dead, self.date_recovered)
+        return counts
+
+
+    # The individual steps of check_progression(), which is used by update_states_pre() instead since it makes a single pass over the exposed people
     def check_infectious(self):
         ''' Check if they become infectious '''
         inds = self.check_inds(self.infectious, self.date_infectious, filter_inds=self.is_exp)
@@ -205,7 +207,7 @@ class People(cvb.BasePeople):
 
 
     def check_death(self):
-        ''' Check whether or not this person died on this timestep  '''
+        ''' Check whether or not this person died on this timestep '''
         inds = self.check_inds(self.dead, self.date_dead, filter_inds=self.is_exp)
         self.exposed[inds]     = False
         self.infectious[inds]  = False
@@ -243,15 +245,20 @@ class People(cvb.BasePeople):
     def check_quar(self):
         '''Update quarantine state'''
 
-        n_quarantined = 0
-        for ind, end_day in self._pending_quarantine[self.t]:
-            if self.quarantined[ind]:
-                self.date_end_quarantine[ind] = max(self.date_end_quarantine[ind], end_day) # Extend quarantine if required
-            elif not (self.dead[ind] | self.recovered[ind] | self.diagnosed[ind]):
-                self.quarantined[ind] = True
-                self.date_quarantined[ind] = self.t
-                self.date_end_quarantine[ind] = end_day
-                n_quarantined += 1
+        # Handle everyone scheduled to start quarantine today
+        pending_inds = self._pending_quarantine_inds.pop(self.t, [])
+        pending_ends = self._pending_quarantine_ends.pop(self.t, [])
+        inds = np.concatenate(pending_inds) if len(pending_inds) else np.empty(0, dtype=np.int64)
+        ends = np.concatenate(pending_ends) if len(pending_ends) else np.empty(0, dtype=cvd.default_float)
+        already  = self.quarantined[inds] # People already in quarantine, which may need to be extended
+        eligible = ~(self.dead[inds] | self.recovered[inds] | self.diagnosed[inds]) # People who can enter quarantine
+        new_inds = np.unique(inds[~already & eligible])
+        self.quarantined[new_inds] = True
+        self.date_quarantined[new_inds] = self.t
+        self.date_end_quarantine[new_inds] = np.nan # Cleared so the end date comes only from today's requests
+        keep = already | eligible
+        np.fmax.at(self.date_end_quarantine, inds[keep], ends[keep]) # Use the latest end date requested, extending quarantine if required
+        n_quarantined = len(new_inds)
 
         # If someone on quarantine has reached the end of their quarantine, release them
         end_inds = self.check_inds(~self.quarantined, self.date_end_quarantine, filter_inds=None) # Note the double-negative here
@@ -297,20 +304,25 @@ class People(cvb.BasePeople):
             count (int): number of people infected
         '''
 
-        # Remove duplicates
-        unique = np.unique(inds, return_index=True)[1]
-        inds = inds[unique]
-        if source is not None:
-            source = source[unique]
-
-        # Keep only susceptibles
-        keep = self.susceptible[inds] # Unique indices in inds and source that are also susceptible
+        # Keep only susceptibles -- done first, since all entries for the same person are either kept or not
+        keep = self.susceptible[inds] # Indices in inds and source that are also susceptible
         inds = inds[keep]
         if source is not None:
             source = source[keep]
 
+        # Remove duplicates, keeping the first entry for each person; as with np.unique(), people end up sorted by index
+        order = np.argsort(inds, kind='stable')
+        inds  = inds[order]
+        first = np.ones(len(inds), dtype=bool)
+        first[1:] = inds[1:] != inds[:-1]
+        inds = inds[first]
+        if source is not None:
+            source = source[order[first]]
+
         n_infections = len(inds)
-        durpars      = self.pars['dur']
+        if not n_infections: # Nothing to do, and skipping the rest doesn't change the random stream since no samples would be drawn
+            return 0
+        durpars = self.pars['dur']
 
         # Set states
         self.susceptible[inds]   = False
@@ -319,8 +331,7 @@ class People(cvb.BasePeople):
         self.flows['new_infections'] += len(inds)
 
         # Record transmissions
-        for i, target in enumerate(inds):
-            self.infection_log.append(dict(source=source[i] if source is not None else None, target=target, date=self.t, layer=layer))
+        self.infection_log.add(date=self.t, target=inds, source=source, layer=layer)
 
         # Calculate how long before this person can infect other people
         self.dur_exp2inf[inds] = cvu.sample(**durpars['exp2inf'], size=n_infections)
@@ -354,7 +365,9 @@ class People(cvb.BasePeople):
         # CASE 2.2: Severe cases: hospitalization required, may become critical
         self.dur_sym2sev[sev_inds] = cvu.sample(**durpars['sym2sev'], size=len(sev_inds)) # Store how long this person took to develop severe symptoms
         self.date_severe[sev_inds] = self.date_symptomatic[sev_inds] + self.dur_sym2sev[sev_inds]  # Date symptoms become severe
-        crit_probs = self.pars['rel_crit_prob'] * self.crit_prob[sev_inds] * (self.pars['no_hosp_factor'] if hosp_max else 1.)# Probability of these people becoming critical - higher if no beds available
+        crit_probs = self.pars['rel_crit_prob'] * self.crit_prob[sev_inds] # Probability of these people becoming critical
+        if hosp_max:
+            crit_probs *= self.pars['no_hosp_factor'] # Higher if no beds available
         is_crit = cvu.binomial_arr(crit_probs)  # See if they're a critical case
         crit_inds = sev_inds[is_crit]
         non_crit_inds = sev_inds[~is_crit]
@@ -367,7 +380,9 @@ class People(cvb.BasePeople):
         # CASE 2.2.2: Critical cases: ICU required, may die
         self.dur_sev2crit[crit_inds] = cvu.sample(**durpars['sev2crit'], size=len(crit_inds))
         self.date_critical[crit_inds] = self.date_severe[crit_inds] + self.dur_sev2crit[crit_inds]  # Date they become critical
-        death_probs = self.pars['rel_death_prob'] * self.death_prob[crit_inds] * (self.pars['no_icu_factor'] if icu_max else 1.) # Probability they'll die
+        death_probs = self.pars['rel_death_prob'] * self.death_prob[crit_inds] # Probability they'll die
+        if icu_max:
+            death_probs *= self.pars['no_icu_factor'] # Higher if no ICU beds available
         is_dead = cvu.binomial_arr(death_probs)  # Death outcome
         dead_inds = crit_inds[is_dead]
         alive_inds = crit_inds[~is_dead]
@@ -435,8 +450,9 @@ class People(cvb.BasePeople):
 
         start_date = self.t if start_date is None else int(start_date)
         period = self.pars['quar_period'] if period is None else int(period)
-        for ind in inds:
-            self._pending_quarantine[start_date].append((ind, start_date + period))
+        inds = sc.promotetoarray(inds).astype(np.int64)
+        self._pending_quarantine_inds[start_date].append(inds)
+        self._pending_quarantine_ends[start_date].append(np.full(len(inds), start_date + period, dtype=cvd.default_float))
         return
 
 
@@ -522,6 +538,9 @@ class People(cvb.BasePeople):
         uids = sc.promotetolist(uid)
         uids.extend(args)
 
+        log = self.infection_log
+        n_secondary = np.bincount(log.source[log.source >= 0], minlength=len(self)) # Number of people each person infected
+
         for uid in uids:
 
             p = self[uid]
@@ -574,7 +593,8 @@ class People(cvb.BasePeople):
                 if not np.isnan(date):
                     events.append((date, message))
 
-            for infection in self.infection_log:
+            for ind in cvu.true((log.target == uid) | (log.source == uid)): # Only look at infections involving this person
+                infection = log[ind]
                 lkey = infection['layer']
                 llabel = label_lkey(lkey)
                 if infection['target'] == uid:
@@ -584,7 +604,7 @@ class People(cvb.BasePeople):
                         events.append((infection['date'], f'was infected with COVID as a seed infection'))
 
                 if infection['source'] == uid:
-                    x = len([a for a in self.infection_log if a['source'] == infection['target']])
+                    x = n_secondary[infection['target']]
                     events.append((infection['date'],f'gave COVID to {infection["target"]} via the {llabel} layer ({x} secondary infections)'))
 
             if len(events):
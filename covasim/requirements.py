@@ -5,11 +5,12 @@ or errors if not.
 
 #%% Housekeeping
 
-__all__ = ['available', 'min_versions', 'check_sciris', 'check_scirisweb', 'check_synthpops']
+__all__ = ['available', 'min_versions', 'pandas_engines', 'check_sciris', 'check_scirisweb', 'check_synthpops', 'check_calamine', 'check_pyarrow']
 
 
 available = {} # Make this available at the module level
 min_versions = {'sciris':'0.17.0', 'scirisweb':'0.17.0'}
+pandas_engines = {'calamine':'2.2.0'} # Pandas versions that first support each optional reading engine
 
 
 #%% Check dependencies
@@ -82,5 +83,37 @@ def check_synthpops(verbose=False, die=False):
 
     return
 
+
+def _check_optional(name, module, purpose, verbose=False):
+    ''' Check whether an optional module is available and, if it is a reading engine, supported by pandas '''
+
+    # Only check once, since this is called every time data are loaded
+    if name not in available:
+        import importlib
+        import sciris as sc
+        import pandas as pd
+        try:
+            importlib.import_module(module)
+            min_pandas = pandas_engines.get(name)
+            available[name] = min_pandas is None or sc.compareversions(pd.__version__, min_pandas) >= 0
+            if verbose and not available[name]:
+                print(f'{module} is installed, but pandas {pd.__version__} does not support it ({min_pandas} is required)')
+        except ImportError as E:
+            available[name] = False
+            if verbose:
+                print(f'{module} (for {purpose}) is not available ({str(E)})')
+
+    return available[name]
+
+
+def check_calamine(verbose=False):
+    ''' Check whether python-calamine (for fast Excel loading) is available and supported by pandas '''
+    return _check_optional('calamine', 'python_calamine', 'faster Excel loading', verbose=verbose)
+
+
+def check_pyarrow(verbose=False):
+    ''' Check whether pyarrow (for Parquet and Feather files) is available '''
+    return _check_optional('pyarrow', 'pyarrow', 'reading Parquet and Feather files', verbose=verbose)
+
 # Perform the version checks on import
 check_sciris()
\ No newline at end of file
@@ -27,7 +27,7 @@ class Sim(cvb.BaseSim):
 
     Args:
         pars     (dict):   parameters to modify from their default values
-        datafile (str/df): filename of (Excel, CSV) data file to load, or a pandas dataframe of the data
+        datafile (str/df): filename of (Excel, CSV, JSON, Parquet, Feather) data file to load, or a pandas dataframe of the data
         datacols (list):   list of column names of the data to load
         label    (str):    the name of the simulation (useful to distinguish in batch runs)
         simfile  (str):    the filename for this simulation, if it's saved (default: creation date)
@@ -470,23 +470,24 @@ class Sim(cvb.BaseSim):
             raise AlreadyRunError('Simulation already complete (call sim.initialize() to re-run)')
 
         t = self.t
+        pars = self.pars # Shorten, and use the dict directly since sim[key] adds overhead on every lookup
 
         # Perform initial operations
         self.rescale() # Check if we need to rescale
         people   = self.people # Shorten this for later use
         people.update_states_pre(t=t) # Update the state of everyone and count the flows
         contacts = people.update_contacts() # Compute new contacts
-        hosp_max = people.count('severe')   > self['n_beds_hosp'] if self['n_beds_hosp'] else False # Check for acute bed constraint
-        icu_max  = people.count('critical') > self['n_beds_icu']  if self['n_beds_icu']  else False # Check for ICU bed constraint
+        hosp_max = people.count('severe')   > pars['n_beds_hosp'] if pars['n_beds_hosp'] else False # Check for acute bed constraint
+        icu_max  = people.count('critical') > pars['n_beds_icu']  if pars['n_beds_icu']  else False # Check for ICU bed constraint
 
         # Randomly infect some people (imported infections)
-        n_imports = cvu.poisson(self['n_imports']) # Imported cases
+        n_imports = cvu.poisson(pars['n_imports']) # Imported cases
         if n_imports>0:
             importation_inds = cvu.choose(max_n=len(people), n=n_imports)
             people.infect(inds=importation_inds, hosp_max=hosp_max, icu_max=icu_max, layer='importation')
 
         # Apply interventions
-        for intervention in self['interventions']:
+        for intervention in pars['interventions']:
             if isinstance(intervention, cvi.Intervention):
                 intervention.apply(self) # If it's an intervention, call the apply() method
             elif callable(intervention):
@@ -498,37 +499,41 @@ class Sim(cvb.BaseSim):
         people.update_states_post() # Check for state changes after interventions
 
         # Compute the probability of transmission
-        beta         = cvd.default_float(self['beta'])
-        asymp_factor = cvd.default_float(self['asymp_factor'])
-        frac_time    = cvd.default_float(self['viral_dist']['frac_time'])
-        load_ratio   = cvd.default_float(self['viral_dist']['load_ratio'])
-        high_cap     = cvd.default_float(self['viral_dist']['high_cap'])
+        beta         = cvd.default_float(pars['beta'])
+        asymp_factor = cvd.default_float(pars['asymp_factor'])
+        frac_time    = cvd.default_float(pars['viral_dist']['frac_time'])
+        load_ratio   = cvd.default_float(pars['viral_dist']['load_ratio'])
+        high_cap     = cvd.default_float(pars['viral_dist']['high_cap'])
         date_inf     = people.date_infectious
         date_rec     = people.date_recovered
         date_dead    = people.date_dead
         viral_load = cvu.compute_viral_load(t, date_inf, date_rec, date_dead, frac_time, load_ratio, high_cap)
 
+        # Get the people arrays that are the same for every layer (modified in place by people.infect())
+        rel_trans = people.rel_trans
+        rel_sus   = people.rel_sus
+        inf       = people.infectious
+        sus       = people.susceptible
+        symp      = people.symptomatic
+        diag      = people.diagnosed
+        quar      = people.quarantined
+
         for lkey,layer in contacts.items():
-            p1 = layer['p1']
-            p2 = layer['p2']
-            betas   = layer['beta']
+            beta_layer = cvd.default_float(pars['beta_layer'][lkey])
+            if not beta_layer: # Skip if beta is 0 for this layer, since no one can be infected (and no random numbers are drawn)
+                continue
+            p1    = layer['p1']
+            p2    = layer['p2']
+            betas = layer['beta']
 
             # Compute relative transmission and susceptibility
-            rel_trans   = people.rel_trans
-            rel_sus     = people.rel_sus
-            inf         = people.infectious
-            sus         = people.susceptible
-            symp        = people.symptomatic
-            diag        = people.diagnosed
-            quar        = people.quarantined
-            iso_factor  = cvd.default_float(self['iso_factor'][lkey])
-            quar_factor = cvd.default_float(self['quar_factor'][lkey])
-            beta_layer  = cvd.default_float(self['beta_layer'][lkey])
-            rel_trans, rel_sus = cvu.compute_trans_sus(rel_trans, rel_sus, inf, sus, beta_layer, viral_load, symp, diag, quar, asymp_factor, iso_factor, quar_factor)
+            iso_factor  = cvd.default_float(pars['iso_factor'][lkey])
+            quar_factor = cvd.default_float(pars['quar_factor'][lkey])
+            layer_trans, layer_sus = cvu.compute_trans_sus(rel_trans, rel_sus, inf, sus, beta_layer, viral_load, symp, diag, quar, asymp_factor, iso_factor, quar_factor)
 
             # Calculate actual transmission
             for sources,targets in [[p1,p2], [p2,p1]]: # Loop over the contact network from p1->p2 and p2->p1
-                source_inds, target_inds = cvu.compute_infections(beta, sources, targets, betas, rel_trans, rel_sus) # Calculate transmission!
+                source_inds, target_inds = cvu.compute_infections(beta, sources, targets, betas, layer_trans, layer_sus) # Calculate transmission!
                 people.infect(inds=target_inds, hosp_max=hosp_max, icu_max=icu_max, source=source_inds, layer=lkey) # Actually infect people
 
         # Update counts for this time step: stocks
@@ -540,7 +545,7 @@ class Sim(cvb.BaseSim):
             self.results[key][t] += count
 
         # Apply analyzers -- same syntax as interventions
-        for analyzer in self['analyzers']:
+        for analyzer in pars['analyzers']:
             if isinstance(analyzer, cva.Analyzer):
                 analyzer.apply(self) # If it's an intervention, call the apply() method
             elif callable(analyzer):
@@ -613,7 +618,7 @@ class Sim(cvb.BaseSim):
             # Print progress
             if verbose:
                 simlabel = f'"{self.label}": ' if self.label else ''
-                string = f'  Running {simlabel}{self.datevec[self.t]} ({self.t:2.0f}/{self.pars["n_days"]}) ({elapsed:0.2f} s) '
+                string = f'  Running {simlabel}{self.date(self.t)} ({self.t:2.0f}/{self.pars["n_days"]}) ({elapsed:0.2f} s) '
                 if verbose >= 2:
                     sc.heading(string)
                 else:
@@ -807,9 +812,9 @@ class Sim(cvb.BaseSim):
                     source_dates[ind] = t
 
             # Targets are hard -- loop over the transmission tree
-            for transdict in self.people.infection_log:
-                source = transdict['source']
-                if source is not None and source in source_dates: # Skip seed infections and people with e.g. recovery after the end of the sim
+            log = self.people.infection_log
+            for source in log.source[log.source >= 0].tolist(): # Skip seed infections
+                if source in source_dates: # Skip people with e.g. recovery after the end of the sim
                     source_date = source_dates[source]
                     targets[source_date] += 1
 
@@ -847,28 +852,22 @@ class Sim(cvb.BaseSim):
             gen_time (dict): the generation time results
         '''
 
-        intervals1 = np.zeros(len(self.people))
-        intervals2 = np.zeros(len(self.people))
-        pos1 = 0
-        pos2 = 0
+        log = self.people.infection_log
+        has_source = log.source >= 0 # Skip seed infections
+        source_inds = log.source[has_source]
+        target_inds = log.target[has_source]
         date_exposed = self.people.date_exposed
         date_symptomatic = self.people.date_symptomatic
 
-        for infection in self.people.infection_log:
-            if infection['source'] is not None:
-                source_ind = infection['source']
-                target_ind = infection['target']
-                intervals1[pos1] = date_exposed[target_ind] - date_exposed[source_ind]
-                pos1 += 1
-                if np.isfinite(date_symptomatic[source_ind]) and np.isfinite(date_symptomatic[target_ind]):
-                    intervals2[pos2] = date_symptomatic[target_ind] - date_symptomatic[source_ind]
-                    pos2 += 1
+        intervals1 = (date_exposed[target_inds] - date_exposed[source_inds]).astype(np.float64)
+        both_symp = np.isfinite(date_symptomatic[source_inds]) & np.isfinite(date_symptomatic[target_inds])
+        intervals2 = (date_symptomatic[target_inds[both_symp]] - date_symptomatic[source_inds[both_symp]]).astype(np.float64)
 
         self.results['gen_time'] = {
-                'true':         np.mean(intervals1[:pos1]),
-                'true_std':     np.std(intervals1[:pos1]),
-                'clinical':     np.mean(intervals2[:pos2]),
-                'clinical_std': np.std(intervals2[:pos2])}
+                'true':         np.mean(intervals1),
+                'true_std':     np.std(intervals1),
+                'clinical':     np.mean(intervals2),
+                'clinical_std': np.std(intervals2)}
         return self.results['gen_time']
 
 
@@ -5,6 +5,7 @@ Numerical utilities for running Covasim
 #%% Housekeeping
 
 import numba  as nb # For faster computations
+import functools as ft # For caching distribution parameters
 import numpy  as np # For numerics
 import random # Used only for resetting the seed
 import scipy.stats as sps # For distributions
@@ -87,18 +88,80 @@ def compute_trans_sus(rel_trans,  rel_sus,    inf,       sus,       beta_layer,
 
 @nb.njit(             (nbfloat,  nbint[:], nbint[:],  nbfloat[:],  nbfloat[:], nbfloat[:]), cache=True, parallel=parallel)
 def compute_infections(beta,     sources,  targets,   layer_betas, rel_trans,  rel_sus):
-    ''' The heaviest step of the model -- figure out who gets infected on this timestep '''
-    betas           = beta * layer_betas  * rel_trans[sources] * rel_sus[targets] # Calculate the raw transmission probabilities
-    nonzero_inds    = betas.nonzero()[0] # Find nonzero entries
-    nonzero_betas   = betas[nonzero_inds] # Remove zero entries from beta
-    nonzero_sources = sources[nonzero_inds] # Remove zero entries from the sources
-    nonzero_targets = targets[nonzero_inds] # Remove zero entries from the targets
-    transmissions   = (np.random.random(len(nonzero_betas)) < nonzero_betas).nonzero()[0] # Compute the actual infections!
-    source_inds     = nonzero_sources[transmissions]
-    target_inds     = nonzero_targets[transmissions] # Filter the targets on the actual infections
+    '''
+    The heaviest step of the model -- figure out who gets infected on this timestep.
+    The transmission probabilities are calculated and filtered in a single loop,
+    rather than as array operations, to avoid creating several temporary arrays
+    the size of the contact network.
+    '''
+    n_contacts    = len(sources)
+    nonzero_inds  = np.empty(n_contacts, dtype=np.int64) # Indices of contacts with nonzero transmission probability
+    nonzero_betas = np.empty(n_contacts, dtype=rel_trans.dtype) # The corresponding probabilities
+    n_nonzero     = 0
+    for i in range(n_contacts):
+        this_beta = beta * layer_betas[i] * rel_trans[sources[i]] * rel_sus[targets[i]] # Calculate the raw transmission probability
+        if this_beta != 0: # Remove zero entries
+            nonzero_inds[n_nonzero]  = i
+            nonzero_betas[n_nonzero] = this_beta
+            n_nonzero += 1
+    transmissions = (np.random.random(n_nonzero) < nonzero_betas[:n_nonzero]).nonzero()[0] # Compute the actual infections!
+    trans_inds    = nonzero_inds[transmissions]
+    source_inds   = sources[trans_inds]
+    target_inds   = targets[trans_inds] # Filter the targets on the actual infections
     return source_inds, target_inds
 
 
+@nb.njit(           (nbint, nb.int64[:], nbbool[:], nbbool[:],  nbbool[:],   nbbool[:], nbbool[:], nbbool[:], nbbool[:], nbfloat[:],      nbfloat[:],       nbfloat[:],  nbfloat[:],    nbfloat[:], nbfloat[:]), cache=True)
+def update_states(t,     inds,        exposed,   infectious, symptomatic, severe,    critical,  recovered, dead,      date_infectious, date_symptomatic, date_severe, date_critical, date_dead,  date_recovered):
+    '''
+    Apply all the disease progressions that are due on this timestep -- becoming
+    infectious, symptomatic, severe, or critical, dying, or recovering -- for the
+    people in inds (i.e. those currently exposed). All six checks are done in a
+    single pass over each person, rather than as six separate array operations.
+    Undefined (NaN) dates never compare as due.
+
+    Returns:
+        counts (tuple): the number of new infectious, symptomatic, severe, critical, deaths, and recoveries
+    '''
+    n_infectious  = 0
+    n_symptomatic = 0
+    n_severe      = 0
+    n_critical    = 0
+    n_deaths      = 0
+    n_recoveries  = 0
+    for i in inds:
+        if not infectious[i] and date_infectious[i] <= t:
+            infectious[i] = True
+            n_infectious += 1
+        if not symptomatic[i] and date_symptomatic[i] <= t:
+            symptomatic[i] = True
+            n_symptomatic += 1
+        if not severe[i] and date_severe[i] <= t:
+            severe[i] = True
+            n_severe += 1
+        if not critical[i] and date_critical[i] <= t:
+            critical[i] = True
+            n_critical += 1
+        if not dead[i] and date_dead[i] <= t:
+            exposed[i]     = False
+            infectious[i]  = False
+            symptomatic[i] = False
+            severe[i]      = False
+            critical[i]    = False
+            recovered[i]   = False
+            dead[i]        = True
+            n_deaths += 1
+        if not recovered[i] and date_recovered[i] <= t:
+            exposed[i]     = False
+            infectious[i]  = False
+            symptomatic[i] = False
+            severe[i]      = False
+            critical[i]    = False
+            recovered[i]   = True
+            n_recoveries += 1
+    return n_infectious, n_symptomatic, n_severe, n_critical, n_deaths, n_recoveries
+
+
 @nb.njit((nbint[:], nbint[:], nb.int64[:]), cache=True)
 def find_contacts(p1, p2, inds):
     """
@@ -169,8 +232,10 @@ def sample(dist=None, par1=None, par2=None, size=None, **kwargs):
     elif dist == 'neg_binomial':  samples = n_neg_binomial(rate=par1, dispersion=par2, n=size, **kwargs) # Use custom version below
     elif dist in ['lognormal', 'lognormal_int']:
         if par1>0:
-            mean  = np.log(par1**2 / np.sqrt(par2 + par1**2)) # Computes the mean of the underlying normal distribution
-            sigma = np.sqrt(np.log(par2/par1**2 + 1)) # Computes sigma for the underlying normal distribution
+            try:
+                mean, sigma = _lognormal_pars(par1, par2) # Computes the mean and sigma of the underlying normal distribution
+            except TypeError: # The parameters are not hashable (e.g. arrays), so they can't be cached
+                mean, sigma = _lognormal_pars.__wrapped__(par1, par2)
             samples = np.random.lognormal(mean=mean, sigma=sigma, size=size, **kwargs)
         else:
             samples = np.zeros(size)
@@ -184,6 +249,17 @@ def sample(dist=None, par1=None, par2=None, size=None, **kwargs):
     return samples
 
 
+@ft.lru_cache(maxsize=128) # Distributions are sampled repeatedly with the same few parameters, e.g. durations in people.infect(); bounded since e.g. calibrations try many values
+def _lognormal_pars(par1, par2):
+    '''
+    Convert the mean and variance of a lognormal distribution to the mean and
+    sigma of the underlying normal distribution, as used by np.random.lognormal().
+    '''
+    mean  = np.log(par1**2 / np.sqrt(par2 + par1**2)) # Computes the mean of the underlying normal distribution
+    sigma = np.sqrt(np.log(par2/par1**2 + 1)) # Computes sigma for the underlying normal distribution
+    return mean, sigma
+
+
 def get_pdf(dist=None, par1=None, par2=None):
     '''
     Return a probability density function for the specified distribution. This
@@ -133,7 +133,14 @@ def test_misc():
 
     # Data loading
     cv.load_data(csv_file)
-    cv.load_data(xlsx_file)
+    data = cv.load_data(xlsx_file)
+
+    # Reloading an unchanged file should give the same data, but not the same object
+    data2 = cv.load_data(xlsx_file)
+    assert data2.equals(data)
+    assert data2 is not data
+    cv.clear_data_cache()
+    assert cv.load_data(xlsx_file).equals(data)
 
     with pytest.raises(NotImplementedError):
         cv.load_data('example_data.unsupported_extension')
@@ -195,6 +202,27 @@ def test_people():
     sim = cv.Sim(pop_size=100, n_days=10, verbose=verbose, dynam_layer={'a':1})
     sim.run()
 
+    # Test the infection log
+    log = sim.people.infection_log
+    assert len(log) == sim.results['cum_infections'][-1]
+    assert len(list(log)) == len(log)
+    assert log[0]['source'] is None # Seed infection
+    assert (log.target == [entry['target'] for entry in log]).all()
+    assert log[:3] == list(log)[:3] # Slices give lists of entries
+    assert log == list(log)
+    sim2 = cv.Sim(pop_size=100, n_days=10, verbose=verbose, dynam_layer={'a':1})
+    sim2.run()
+    assert log == sim2.people.infection_log # Identical seeded runs give identical logs
+    assert log.to_df()['target'].tolist() == log.target.tolist()
+    sim.people.story(log[-1]['source'], log[-1]['target'])
+
+    # Test that the individual progression checks still work, and find nothing left to do after check_progression()
+    people = sim.people
+    people.is_exp = people.true('exposed') # Normally set by update_states_pre()
+    checks = [people.check_infectious, people.check_symptomatic, people.check_severe, people.check_critical, people.check_death, people.check_recovery]
+    assert sum(people.check_progression()) == 0
+    assert sum(check() for check in checks) == 0
+
     return
 
 
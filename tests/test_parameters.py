@@ -24,6 +24,40 @@ def test_data():
     data = cv.load_data(os.path.join(sc.thisdir(__file__), 'example_data.csv'))
     sc.pp(data)
 
+    # Check that partial loading works
+    partial = cv.load_data(os.path.join(sc.thisdir(__file__), 'example_data.csv'), nrows=10)
+    assert len(partial) == 10
+
+    # Check that CSV files are read as by pd.read_csv(), including missing values and user-specified dates
+    missing_file = os.path.join(sc.thisdir(__file__), 'example_data_missing.csv')
+    with open(missing_file, 'w') as f:
+        f.write('date,new_diagnoses,new_tests,notes,reported\n2020-03-01,1,,NA,3/2/2020\n2020-03-02,,4,,3/3/2020\n2020-03-03,3,5,ok,3/4/2020\n')
+    missing = cv.load_data(missing_file, cache=False, verbose=False)
+    assert missing['notes'].isna().sum() == 2
+    assert missing['reported'].dtype == object
+    reported = cv.load_data(missing_file, cache=False, verbose=False, parse_dates=['date', 'reported'])
+    assert reported['reported'].dtype == 'datetime64[ns]'
+    assert cv.load_data(missing_file, cache=False, verbose=False, check_date=False)['date'].tolist() == ['2020-03-01', '2020-03-02', '2020-03-03'] # Left as strings
+    os.remove(missing_file)
+
+    # Check that the binary columnar formats round-trip, if pyarrow is available
+    if cv.requirements.check_pyarrow():
+        for ext in ['parquet', 'feather']:
+            binary_file = os.path.join(sc.thisdir(__file__), f'example_data.{ext}')
+            getattr(data.reset_index(drop=True), f'to_{ext}')(binary_file)
+            assert cv.load_data(binary_file).equals(data)
+            assert len(cv.load_data(binary_file, columns=['date', 'new_diagnoses']).columns) == 3 # Including the calculated cum_diagnoses
+            with pytest.raises(ValueError):
+                cv.load_data(binary_file, columns=['date', 'missing_column'])
+            os.remove(binary_file)
+
+    # Check that a missing date column is reported by load_data() rather than by pandas
+    nodate_file = os.path.join(sc.thisdir(__file__), 'example_data_nodate.csv')
+    data.drop(columns='date').to_csv(nodate_file, index=False)
+    with pytest.raises(ValueError, match='Required column "date"'):
+        cv.load_data(nodate_file, nrows=10)
+    os.remove(nodate_file)
+
     # Check that it is looking for the right file
     with pytest.raises(FileNotFoundError):
         data = cv.load_data(datafile='file_not_found.csv')
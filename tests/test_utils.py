@@ -112,6 +112,13 @@ def test_samples(doplot=False):
             pl.hist(x=results[choice], bins=nbins)
             pl.title(f'dist={choice}, par1={par1}, par2={par2}')
 
+    # Check that unhashable parameters, which can't be cached, give the same samples
+    cv.set_seed(1)
+    a = cv.sample(dist='lognormal', par1=np.array([5.0]), par2=1.0, size=2)
+    cv.set_seed(1)
+    b = cv.sample(dist='lognormal', par1=5.0, par2=1.0, size=2)
+    assert np.allclose(a, b)
+
     with pytest.raises(NotImplementedError):
         cv.sample(dist='not_found')
 